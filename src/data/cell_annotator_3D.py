@@ -232,11 +232,9 @@ class MainWindow():
     def save_rois(self):
         n_rois = len(self.ROIs)
         data_mat = np.zeros((n_rois,4))
-        for nr in range(n_rois):
-            data_mat[nr,0] = self.ROIs[nr][0]
-            data_mat[nr,1] = self.ROIs[nr][1]
-            data_mat[nr,3] = self.ROIs[nr][2]
-            data_mat[nr,2] = self.ROIids[nr]
+        # Columns are x, y, id, z
+        data_mat[:,[0,1,3]] = np.reshape(self.ROIs, (n_rois,3))
+        data_mat[:,2] = self.ROIids
         data_dict = { "roidata": data_mat}
         filename = os.path.join(os.path.commonpath([self.gfp_dirname, self.tom_dirname]),  im_title + "_ROIs.npy")
         print("Saving ROIs to: {}".format(filename))
@@ -302,6 +300,9 @@ class image_window():
     def __init__(self, nr, main, position, im_dir, gfp_tom_data=None ):
         self.top = tk.Toplevel()
 
+        # Resized planes, filled in by update_im the first time a plane is shown
+        self.resized_planes = {}
+
         # Load image from file
         if gfp_tom_data is None:
             title_name = im_title
@@ -309,11 +310,15 @@ class image_window():
 
             # Load image and get meta_data
             self.planes_list = []
-            for it, filename in enumerate(os.listdir(im_dir)):
-                if filename.endswith('.tif'):
-                        im = cv2.imread(os.path.join(im_dir, filename))
-                        im = im[:, :, 1]
-                        self.planes_list.append(im)
+            # Sorted, so that planes are in z-order regardless of file system
+            with os.scandir(im_dir) as entries:
+                plane_files = sorted(entry.path for entry in entries
+                                     if entry.is_file() and entry.name.endswith('.tif'))
+            for filename in plane_files:
+                im = cv2.imread(filename)
+                # Copy the channel, so the 3-channel decode is not kept alive
+                im = im[:, :, 1].copy()
+                self.planes_list.append(im)
             
             self.top = tk.Toplevel()
             self.top.title(str(nr))
@@ -326,14 +331,15 @@ class image_window():
         # Construct image from gfp_tom_data
         else:
             self.top.title(im_title + "Merge")
-            self.planes_list = []
+            # One contiguous buffer for all merged planes; planes_list holds views
+            n_planes = len(gfp_tom_data[0])
+            self.merged_planes = np.zeros( (n_planes, gfp_tom_data[0][0].shape[0], gfp_tom_data[0][0].shape[1], 3), np.uint8)
             for it, plane in enumerate(gfp_tom_data[0]):
-            
-                self.im = np.zeros( (gfp_tom_data[0][0].shape[0], gfp_tom_data[0][0].shape[1], 3), np.uint8)
-                self.im[:,:,0] = gfp_tom_data[0][it]
-                self.im[:,:,1] = gfp_tom_data[1][it]
-                self.im_height, self.im_width = self.im.shape[:2]
-                self.planes_list.append(self.im)
+                self.merged_planes[it,:,:,0] = gfp_tom_data[0][it]
+                self.merged_planes[it,:,:,1] = gfp_tom_data[1][it]
+            self.planes_list = list(self.merged_planes)
+            self.im = self.planes_list[-1]
+            self.im_height, self.im_width = self.im.shape[:2]
                         
             # Set up a slider to choose which z plane to display
             self.nr_z_planes = len(self.planes_list)
@@ -358,16 +364,18 @@ class image_window():
         self.top.geometry('+{}+{}'.format(x_temp, y_temp))
     
 def update_im(val):
+    z = int(val)
+    # ROIs in the displayed plane are the same for all channels, so select them once
+    z_shown = list_ims[2].z_slider.get()
+    roi_vals = [roi for roi in mainwin.roi_data if roi[4] == z_shown]
     for chan in list_ims:
-        chan.im = chan.planes_list[int(val)]
-        chan.im = cv2.resize(chan.im, ImageSize)
+        if z not in chan.resized_planes:
+            chan.resized_planes[z] = cv2.resize(chan.planes_list[z], ImageSize)
+        chan.im = chan.resized_planes[z]
         chan.im_height, chan.im_width = chan.im.shape[:2]
         chan.imgTk = ImageTk.PhotoImage(Image.fromarray(chan.im))
         chan.image_on_canvas = chan.canvas.create_image(0, 0, anchor=tk.NW, image=chan.imgTk)
-        chan.roi_vals = []
-        for roi in range(len(mainwin.roi_data)):
-            if mainwin.roi_data[roi][4] == list_ims[2].z_slider.get():
-                chan.roi_vals.append(mainwin.roi_data[roi])
+        chan.roi_vals = roi_vals
         for roi in chan.roi_vals:
             chan.canvas.create_oval(roi[0], roi[1], roi[2], roi[3], outline=IDcolors[roi[5]], width=ROIthickness)
         chan.top.update()
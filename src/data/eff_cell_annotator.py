@@ -316,10 +316,8 @@ class MainWindow():
     def save_rois(self):
         n_rois = len(self.ROIs)
         data_mat = np.zeros((n_rois,3))
-        for nr in range(n_rois):
-            data_mat[nr,0] = self.ROIs[nr][0]
-            data_mat[nr,1] = self.ROIs[nr][1]
-            data_mat[nr,2] = self.ROIids[nr]
+        data_mat[:,0:2] = np.reshape(self.ROIs, (n_rois,2))
+        data_mat[:,2] = self.ROIids
         data_dict = { "roidata": data_mat}
         filename = os.path.splitext(self.im1_filename)[0] + "-ROIs.npy"
         print("Saving ROIs to: {}".format(filename))
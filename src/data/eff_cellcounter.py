@@ -14,14 +14,20 @@ import os.path
 import importlif as il
 
 im_folder = r'I:\Danielle Paynter\InVivoTTTPilots\efficiency_pilot\data\processed\DP_210520\210628\loc6\6_z'
-ims = os.listdir(im_folder)
-im_list = []
-for it, im in enumerate(ims):
+# Sorted, so that planes are in z-order regardless of file system
+with os.scandir(im_folder) as entries:
+    ims = sorted(entry.name for entry in entries if entry.is_file())
+
+# Read the planes straight into one pre-allocated stack, instead of building
+# a list and copying it over with np.asarray
+first_im = cv2.imread(os.path.join(im_folder, ims[0]), cv2.IMREAD_GRAYSCALE)
+im_buffer = np.empty((len(ims),) + first_im.shape, dtype=first_im.dtype)
+im_buffer[0] = first_im
+for it, im in enumerate(ims[1:], start=1):
     im_path = os.path.join(im_folder, im)
-    im_list.append(cv2.imread(im_path, cv2.IMREAD_GRAYSCALE))
+    im_buffer[it] = cv2.imread(im_path, cv2.IMREAD_GRAYSCALE)
     
-im_stack = np.asarray(im_list)
-im_stack = np.moveaxis(im_stack, 0, 2)
+im_stack = np.moveaxis(im_buffer, 0, 2)
 
 blobs = il.cellcount(im_stack)
 circd = il.circleblobs(blobs, im_stack)
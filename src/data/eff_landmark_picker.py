@@ -19,12 +19,15 @@ def elp(save_data, num_timepoints):
         import os
         import cv2
         import os.path
+        from collections import OrderedDict
+        from concurrent.futures import ThreadPoolExecutor
 
     
     # Settings
         ROImargin = 7
         ROIthickness = 2
         ImageSize = (400, 400)
+        PlaneCacheBytes = 64 * 1024**2  # Max bytes of loaded planes kept per image window
         import tkinter as tk
 
         # List of colors to use as landmark outlines
@@ -36,6 +39,9 @@ def elp(save_data, num_timepoints):
                   'maroon1', 'red2', 'orange', 'yellow', 'light pink', 'thistle1', 'MediumPurple1', 'SkyBlue1', 'DeepPink2',
                   'lemon chiffon']
         
+        # Background reader that loads the next z-plane while the current one is shown
+        prefetcher = ThreadPoolExecutor(max_workers=1)
+        
         # List to hold variables needed to run the canvas.create_oval command in the update_im function
         landmark_circle_data = []
         
@@ -225,19 +231,21 @@ def elp(save_data, num_timepoints):
         
             def __init__(self, timepoint, main, position, im_directory):
                 self.timepoint = timepoint
-                # Load in all tiffs in im_directory, store in a list
-                self.planes_list = []
-                for nr, filename in enumerate(os.listdir(im_directory)):
-                    if filename.endswith('.tif'):
-                        im = cv2.imread(os.path.join(im_directory, filename))
-                        im = im[:, :, 1]
-                        self.planes_list.append(im)
-        
-                self.nr_z_planes = len(self.planes_list)
+                # List all tiffs in im_directory; a plane is only read from disk
+                # the first time it is displayed (see load_plane)
+                with os.scandir(im_directory) as entries:
+                    self.plane_files = sorted(entry.path for entry in entries
+                                              if entry.is_file() and entry.name.endswith('.tif'))
+                self.planes = OrderedDict()
+                self.planes_bytes = 0
+                # (z, future) of the plane being read in the background, see prefetch_plane
+                self.prefetched = None
+        
+                self.nr_z_planes = len(self.plane_files)
                 print("Timepoint {} has {} z-planes.".format(timepoint, self.nr_z_planes))
         
                 # Make the window and give it a boring-but-useful title
-                #(title is used below, in "update_im," to match landmarks to proper image windows)
+                #(matches the timepoint that "update_im" uses to match landmarks to proper image windows)
                 self.top = tk.Toplevel()
                 self.top.title(str(self.timepoint))
         
@@ -250,9 +258,9 @@ def elp(save_data, num_timepoints):
         
         
                 # Set starting image
-                self.im = self.planes_list[self.z_slider.get()]
-                self.im = cv2.resize(self.im, ImageSize)
+                self.im = self.load_plane(self.z_slider.get())
                 self.im_height, self.im_width = self.im.shape
+                self.prefetch_plane(self.z_slider.get() + 1)
         
                 # Create canvas to display image on
                 self.canvas = tk.Canvas(self.top, height=self.im_height, width=self.im_width)
@@ -268,17 +276,52 @@ def elp(save_data, num_timepoints):
                 y_temp = int(position['y'])
                 self.top.geometry('+{}+{}'.format(x_temp, y_temp))
         
+            def read_plane(self, z):
+                """Reads z-plane z from disk at display size"""
+                im = cv2.imread(self.plane_files[z])
+                # Only the resized green channel is kept, so the 3-channel
+                # decode is not kept alive and the slider does not resize again
+                return cv2.resize(im[:, :, 1], ImageSize)
+        
+            def prefetch_plane(self, z):
+                """Starts reading z-plane z in the background, if it is not loaded yet"""
+                if z < 0 or z >= self.nr_z_planes or z in self.planes:
+                    return
+                if self.prefetched is not None:
+                    if self.prefetched[0] == z:
+                        return
+                    self.prefetched[1].cancel()
+                self.prefetched = (z, prefetcher.submit(self.read_plane, z))
+        
+            def load_plane(self, z):
+                """Returns z-plane z at display size, reading it from disk on first use"""
+                if z in self.planes:
+                    self.planes.move_to_end(z)
+                else:
+                    # The background reader only returns planes; the cache is
+                    # only ever modified here, on the tkinter thread
+                    if self.prefetched is not None and self.prefetched[0] == z:
+                        self.planes[z] = self.prefetched[1].result()
+                        self.prefetched = None
+                    else:
+                        self.planes[z] = self.read_plane(z)
+                    self.planes_bytes += self.planes[z].nbytes
+                    # Drop the least recently shown planes once over budget
+                    while self.planes_bytes > PlaneCacheBytes and len(self.planes) > 1:
+                        _, old_plane = self.planes.popitem(last=False)
+                        self.planes_bytes -= old_plane.nbytes
+                return self.planes[z]
+        
             def update_im(self, val):
-                self.im = self.planes_list[int(val)]
-                self.im = cv2.resize(self.im, ImageSize)
+                self.im = self.load_plane(int(val))
                 self.im_height, self.im_width = self.im.shape
+                self.prefetch_plane(int(val) + 1)
                 self.imgTk = ImageTk.PhotoImage(Image.fromarray(self.im))
                 self.image_on_canvas = self.canvas.create_image(0, 0, anchor=tk.NW, image=self.imgTk)
-                self.landmark_vals = []
-                for lm in range(len(landmark_circle_data)):
-                    if landmark_circle_data[lm][5] == self.z_slider.get():
-                        if int(self.top.title()) == int(landmark_circle_data[lm][6]):
-                            self.landmark_vals.append(landmark_circle_data[lm])
+                # Landmarks drawn in this image window, in the displayed plane
+                z_shown = self.z_slider.get()
+                self.landmark_vals = [lm for lm in landmark_circle_data
+                                      if lm[5] == z_shown and int(lm[6]) == self.timepoint]
                 for lm in self.landmark_vals:
                     self.canvas.create_oval(lm[0], lm[1], lm[2], lm[3], outline=colors[lm[4]], width=ROIthickness)
                 self.top.update()
@@ -290,6 +333,7 @@ def elp(save_data, num_timepoints):
         root = tk.Tk()
         MainWindow(root)
         root.mainloop()
+        prefetcher.shutdown(wait=False)
         
         if os.path.isfile(filename):
             return_statement = "Path to excel file with landmarks: {}".format(filename)
@@ -33,20 +33,11 @@ def preproc (image):
     j = color.rgb2gray(image)
     j = j*(255/np.max(j))
     j = j.astype(np.uint8)
-    imx = image.shape[0]
-    imy = image.shape[1]
-    for x in range(imx):
-            for y in range(imy):
-                if j[x,y] <35:
-                    j[x,y] = 0
+    j[j < 35] = 0
     im_blur = cv2.GaussianBlur(j,(301,301),0)
     im_den = cv2.fastNlMeansDenoising(j,None,10,7,31)
-    for x in range(imx):
-        for y in range(imy):
-            if im_blur[x,y] < im_den[x,y]:
-                im_den[x,y] = im_den[x,y] - im_blur[x,y]
-            else:
-                im_den[x,y] = 0
+    # Saturating uint8 subtraction: pixels where the blur is brighter become 0
+    im_den = cv2.subtract(im_den, im_blur)
     im_binary = cv2.threshold(im_den,40,255, cv2.THRESH_BINARY)
     im_bin = im_binary[1]
     return(im_den, im_bin)
@@ -76,16 +67,16 @@ def lumcalc(procd_im_a, blobs):
     means = []
     procd_im = color.rgb2gray(procd_im_a)
     for blob in range(0,blobs.shape[0]):
-        mask=np.zeros(procd_im.shape)
         r = int(blobs[blob,2])
         a = blobs[blob,0]
         b = blobs[blob,1]
         nx = procd_im.shape[0]
         ny = procd_im.shape[1]
         y,x = np.ogrid[-a:nx-a, -b:ny-b]
-        mask = (x*x + y*y <= r*r)*1.0
-        masked_im = mask * procd_im
-        lum = sum(sum(masked_im))/sum(sum(mask))
+        # Boolean mask; averages only the pixels inside the blob, without
+        # building float64 full-image mask and product arrays
+        mask = (x*x + y*y <= r*r)
+        lum = procd_im[mask].mean()
         means.append(lum)
     return(means)
 
@@ -148,20 +139,15 @@ def comparechannels(gfp_circled, gfpblobs, gfp_means, tom_circled, tomblobs, tom
 ##imports
     import numpy as np
     import cv2
-    circ_in_tom = []
-    for blob in range(0,gfpblobs.shape[0]):
-        circ_in_tom.append(gfpblobs[blob,:])
-    circ_in_tom = np.array(circ_in_tom)
+    # The blob arrays are only read, so use them directly instead of copying
+    circ_in_tom = np.asarray(gfpblobs)
     gfp_means_len = len(circ_in_tom)
     for blob in range(gfp_means_len):
         x=int(circ_in_tom[blob,0])
         y=int(circ_in_tom[blob,1])
         r=int(circ_in_tom[blob,3])
         cv2.circle(tom_circled,(y,x), r, (0,255,0), 2)    
-        circ_in_gfp = []
-    for blob in range(0,tomblobs.shape[0]):
-        circ_in_gfp.append(tomblobs[blob,:])
-    circ_in_gfp = np.array(circ_in_gfp)
+    circ_in_gfp = np.asarray(tomblobs)
     tom_means_len = len(circ_in_gfp)
     for blob in range(tom_means_len):
         x=int(circ_in_gfp[blob,0])
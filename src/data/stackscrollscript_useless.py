@@ -9,11 +9,14 @@ def stack_scroll(im_directory, im_title):
     im_stack = []
 
     # Read in all images; append one plane to im_stack
-    for nr, filename in enumerate(os.listdir(im_directory)):
-        if filename.endswith('.tiff'):
-            im = cv2.imread(os.path.join(im_directory, filename))
-            im = im[:, :, 1]
-            im_stack.append(im)
+    # Read in planes in sorted (z) order; os.listdir order is arbitrary
+    with os.scandir(im_directory) as entries:
+        filenames = sorted(entry.path for entry in entries
+                           if entry.is_file() and entry.name.endswith('.tiff'))
+    for filename in filenames:
+        im = cv2.imread(filename)
+        im = im[:, :, 1]
+        im_stack.append(im)
 
         # Convert im_stack to an array and make the axes x, y, z
     im_stack = np.array(im_stack)